@@ -1,45 +1,95 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import json
+import os
+import shutil
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 
+try:
+    import urllib3
+except ImportError:  # optional: without it every download opens its own connection
+    urllib3 = None
+
 ROOT = Path(__file__).resolve().parent.parent
 MANIFEST = ROOT / "meta" / "manifest.json"
+HEADERS = {"User-Agent": "slskdn-fixtures-fetch/1.0"}
+
+# Shared keep-alive pool so assets from the same host reuse TCP/TLS connections.
+HTTP = urllib3.PoolManager(
+    maxsize=8,
+    timeout=60,
+    retries=urllib3.Retry(total=3, backoff_factor=2, status_forcelist=[502, 503, 504]),
+) if urllib3 else None
+
+def part_path(out_path: Path) -> Path:
+    # Bodies land here first and are renamed into place only when complete,
+    # so an interrupted download never passes the already-present check.
+    return out_path.with_suffix(out_path.suffix + ".part")
+
+# Failures worth another attempt. For the pooled path only errors raised while
+# streaming the body are retried here: urllib3's Retry already covers connecting and
+# status codes, and its MaxRetryError means those retries are spent.
+RETRYABLE = (HTTPError, URLError, TimeoutError) + (
+    (urllib3.exceptions.ProtocolError, urllib3.exceptions.ReadTimeoutError) if urllib3 else ()
+)
 
 def download(url: str, out_path: Path, retries: int = 3) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
     if out_path.exists() and out_path.stat().st_size > 0:
         print(f"OK: already present: {out_path.relative_to(ROOT)}")
         return
+    tmp = part_path(out_path)
     attempt = 0
     while True:
         attempt += 1
         try:
             print(f"DL: {url}")
-            req = Request(url, headers={"User-Agent": "slskdn-fixtures-fetch/1.0"})
-            with urlopen(req, timeout=60) as r:
-                data = r.read()
-            out_path.write_bytes(data)
+            if HTTP is not None:
+                download_pooled(url, tmp)
+            else:
+                req = Request(url, headers=HEADERS)
+                with urlopen(req, timeout=60) as r, tmp.open("wb") as w:
+                    shutil.copyfileobj(r, w, length=1024 * 1024)
+            os.replace(tmp, out_path)
             return
-        except (HTTPError, URLError, TimeoutError) as e:
+        except RETRYABLE as e:
+            tmp.unlink(missing_ok=True)
             if attempt >= retries:
                 raise
             wait = 2 * attempt
             print(f"WARN: download failed (attempt {attempt}/{retries}): {e}. Retrying in {wait}s", file=sys.stderr)
             time.sleep(wait)
 
+def download_pooled(url: str, tmp: Path) -> None:
+    r = HTTP.request("GET", url, preload_content=False, headers=HEADERS)
+    try:
+        # Surface error statuses the way urlopen does, so both paths retry them alike.
+        if r.status >= 400:
+            raise HTTPError(url, r.status, r.reason, r.headers, None)
+        with tmp.open("wb") as w:
+            shutil.copyfileobj(r, w, length=1024 * 1024)
+    finally:
+        r.release_conn()
+
 def main() -> int:
     mf = json.loads(MANIFEST.read_text(encoding="utf-8"))
-    for asset in mf.get("assets", []):
-        for d in asset.get("download_via_script", []):
-            url = d["url"]
-            rel = d["path"]
-            out = ROOT / rel
-            download(url, out)
+    tasks = tuple(
+        (d["url"], ROOT / d["path"])
+        for asset in mf.get("assets", [])
+        for d in asset.get("download_via_script", [])
+    )
+    # Fail before starting any download rather than partway through the pool.
+    bad = [url for url, _ in tasks if not url.startswith(("http://", "https://"))]
+    if bad:
+        print(f"ERROR: unsupported URL(s) in manifest: {', '.join(bad)}", file=sys.stderr)
+        return 1
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(lambda t: download(*t), tasks))
     print("OK: downloads complete. Run meta/write_checksums.py to (re)generate checksums.")
     return 0
 
@@ -1,38 +1,81 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import hashlib
+import json
+import mmap
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
+# SHA-256 is part of the contract: generate-manifest.js copies these digests
+# into manifest.json's "sha256" field, and the file stays `sha256sum -c` compatible.
 OUT = ROOT / "meta" / "checksums.sha256"
+# Sidecar memo of {rel: [size, mtime_ns, digest]} so unchanged files are not rehashed.
+STAT_CACHE = ROOT / "meta" / ".checksums.stat.json"
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+SMALL_FILE_BYTES = 256 * 1024
 
-paths: list[Path] = []
-for p in ROOT.rglob("*"):
-    if not p.is_file():
-        continue
-    if p.name in {"checksums.sha256", "_download_list.tsv"}:
-        continue
-    if ".git" in p.parts:
+def sha256_file(path: str) -> str:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        # Small files: one read and a one-shot hash beat mapping/streaming setup.
+        if size < SMALL_FILE_BYTES:
+            return hashlib.sha256(f.read()).hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+SKIP = {"checksums.sha256", ".checksums.stat.json", "_download_list.tsv"}
+
+# Every walked path starts with ROOT, so slicing off the prefix is enough.
+root_str = str(ROOT) + os.sep
+files_by_rel: list[tuple[str, str]] = []
+for root, dirs, files in os.walk(ROOT):
+    dirs[:] = [d for d in dirs if d != ".git"]
+    for name in files:
+        if name in SKIP or name == ".git" or name.endswith((".zip", ".part")):
+            continue
+        p = os.path.join(root, name)
+        files_by_rel.append((p[len(root_str):].replace(os.sep, "/"), p))
+
+files_by_rel.sort()
+
+try:
+    cache = json.loads(STAT_CACHE.read_text(encoding="utf-8"))
+except (OSError, ValueError):
+    cache = {}
+if not isinstance(cache, dict):
+    cache = {}
+
+entries = []
+stale = []
+for rel, p in files_by_rel:
+    # os.walk lists every non-directory; keep regular files only (no dangling
+    # symlinks, FIFOs or sockets).
+    try:
+        st = os.stat(p)
+    except OSError:
         continue
-    if p.suffix == ".zip":
+    if not stat.S_ISREG(st.st_mode):
         continue
-    paths.append(p)
+    entry = [st.st_size, st.st_mtime_ns, None]
+    hit = cache.get(rel)
+    # Anything but a [size, mtime_ns, digest] entry is a cache miss.
+    if isinstance(hit, list) and len(hit) == 3 and hit[:2] == entry[:2] and isinstance(hit[2], str):
+        entry[2] = hit[2]
+    else:
+        stale.append((p, entry))
+    entries.append((rel, entry))
 
-paths.sort(key=lambda p: str(p.relative_to(ROOT)))
+# hashlib releases the GIL while hashing, so threads overlap both IO and
+# hashing without the fork/pickle cost of a process pool.
+with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+    for (_, entry), digest in zip(stale, ex.map(sha256_file, [p for p, _ in stale])):
+        entry[2] = digest
 
-lines = []
-for p in paths:
-    rel = p.relative_to(ROOT)
-    digest = sha256_file(p)
-    lines.append(f"{digest}  {rel}")
+lines = [f"{entry[2]}  {rel}" for rel, entry in entries]
 
 OUT.write_text("\n".join(lines) + "\n", encoding="utf-8")
-print(f"Wrote {len(lines)} entries to {OUT}")
-
+STAT_CACHE.write_text(json.dumps(dict(entries)), encoding="utf-8")
+print(f"Wrote {len(lines)} entries to {OUT} ({len(stale)} rehashed)")
@@ -3,46 +3,68 @@
 Update markdown files to check off completed tasks.
 """
 import json
+import os
 import re
+import shutil
+import tempfile
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional: without it results are read with the json module
+    orjson = None
+
 def update_file_checkboxes(filepath: str, tasks_to_check: list):
     """Update checkboxes in a file"""
+    # Only update actual checkboxes, not headers or TODO comments
+    target_lines = {t['line'] for t in tasks_to_check if t['type'] == 'checkbox'}
+    if not target_lines:
+        return 0
+    
+    tmp_path = None
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            text = f.read()
+        # Nothing left to tick in this file
+        if '[ ]' not in text:
+            return 0
         
-        modified = False
+        lines = text.split('\n')
         updated_count = 0
-        for task_info in tasks_to_check:
-            # Only update actual checkboxes, not headers or TODO comments
-            if task_info['type'] != 'checkbox':
-                continue
-            
-            line_num = task_info['line'] - 1  # 0-indexed
-            if line_num < len(lines):
-                original_line = lines[line_num]
-                # Only update if it's actually an unchecked checkbox
-                if '[ ]' in original_line:
-                    # Replace [ ] with [x] (preserve spacing)
-                    new_line = original_line.replace('[ ]', '[x]', 1)
-                    if new_line != original_line:
-                        lines[line_num] = new_line
-                        modified = True
-                        updated_count += 1
+        for line_num in target_lines:
+            i = line_num - 1  # 0-indexed
+            # Only update if it's actually an unchecked checkbox
+            if i < len(lines) and '[ ]' in lines[i]:
+                # Replace [ ] with [x] (preserve spacing)
+                lines[i] = lines[i].replace('[ ]', '[x]', 1)
+                updated_count += 1
+        if not updated_count:
+            return 0
         
-        if modified:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
-            return updated_count
+        # Write a temp file next to the original, then swap it in atomically
+        with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=os.path.dirname(filepath) or '.', delete=False) as out:
+            tmp_path = out.name
+            out.write('\n'.join(lines))
+        shutil.copymode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+        tmp_path = None
+        return updated_count
     except Exception as e:
         print(f"Error updating {filepath}: {e}")
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
     return 0
 
 def main():
     # Load validation results
-    with open('task_validation_results.json', 'r') as f:
-        validated_tasks = json.load(f)
+    if orjson is not None:
+        with open('task_validation_results.json', 'rb') as f:
+            validated_tasks = orjson.loads(f.read())
+    else:
+        with open('task_validation_results.json', 'r', encoding='utf-8') as f:
+            validated_tasks = json.load(f)
     
     # Group tasks by file
     tasks_by_file = {}
@@ -6,9 +6,43 @@ Checks git commits and code existence for each task.
 import os
 import re
 import subprocess
+import sys
 import json
+import multiprocessing
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Set
+
+try:
+    import ahocorasick
+except ImportError:  # optional: without it keywords are searched with git grep
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # optional: without it results are written with the json module
+    orjson = None
+
+# Task ID patterns in priority order: a line mentioning several IDs is attributed to the first type
+TASK_ID_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(T-\w+-\d+)\b',  # T-SF02, T-SF03, etc.
+    r'\b(H-\d+)\b',       # H-08, H-09, etc.
+    r'\b(SF-\d+)\b',      # SF-01, SF-02, etc.
+    r'\b(TASK-\d+)\b',    # TASK-123
+    r'\b(#[A-Z]+-\d+)\b', # #TASK-123
+))
+# Any task ID, for collecting every ID mentioned in a block of text
+TASK_ID_RE = re.compile(r'\b(T-\w+-\d+|H-\d+|SF-\d+|TASK-\d+|#[A-Z]+-\d+)\b', re.IGNORECASE)
+UNCHECKED_BOX_RE = re.compile(r'^\s*(?:[-*]|\d+\.)\s*\[ \]')
+REVIEW_MARKER_RE = re.compile(r'\(REJECT|\(WARNING|\(ACCEPT')
+CHECKED_RE = re.compile(r'\[x\]', re.IGNORECASE)
+TODO_RE = re.compile(r'\b(TODO|FIXME|XXX|HACK|PLANNED|FUTURE)\b', re.IGNORECASE)
+
+KEYWORD_RE = re.compile(r'\b[a-zA-Z]{5,}\b')
+STOP_WORDS = frozenset({'this', 'that', 'with', 'from', 'have', 'will', 'should', 'would', 'could',
+                        'implement', 'add', 'create', 'update', 'fix', 'remove', 'delete', 'change'})
+
+# Source files searched for task keywords
+CODE_PATHSPECS = ['*.cs', '*.js', '*.jsx', '*.ts', '*.tsx']
 
 def run_git_command(cmd: List[str]) -> str:
     """Run a git command and return output"""
@@ -24,77 +58,126 @@ def run_git_command(cmd: List[str]) -> str:
     except Exception as e:
         return f"ERROR: {e}"
 
+IGNORE_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'bin', 'obj', '.vs', '.idea'}
+
+def walk_md(root: str) -> Iterator[str]:
+    """Yield markdown files under root, skipping ignored and hidden directories"""
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        # DirEntry caches the file type from readdir, so no extra stat per entry
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name in IGNORE_DIRS or entry.name.startswith('.'):
+                continue
+            yield from walk_md(entry.path)
+        elif entry.name.endswith('.md'):
+            yield entry.path
+
 def find_all_md_files() -> List[str]:
     """Find all markdown files in the repo"""
-    md_files = []
-    ignore_dirs = {'.git', 'node_modules', '__pycache__', '.venv', 'bin', 'obj', '.vs', '.idea'}
-    
-    for root, dirs, files in os.walk('.'):
-        # Filter out ignored directories
-        dirs[:] = [d for d in dirs if d not in ignore_dirs and not d.startswith('.')]
-        for file in files:
-            if file.endswith('.md'):
-                full_path = os.path.join(root, file)
-                md_files.append(full_path)
-    return sorted(md_files)
+    return sorted(walk_md('.'))
 
 def extract_task_id(text: str) -> Optional[str]:
     """Extract task ID from text (T-XXX, H-XXX, SF-XXX, etc.)"""
-    patterns = [
-        r'\b(T-\w+-\d+)\b',  # T-SF02, T-SF03, etc.
-        r'\b(H-\d+)\b',       # H-08, H-09, etc.
-        r'\b(SF-\d+)\b',      # SF-01, SF-02, etc.
-        r'\b(TASK-\d+)\b',    # TASK-123
-        r'\b(#[A-Z]+-\d+)\b', # #TASK-123
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in TASK_ID_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1).upper()
     return None
 
-def check_git_commits(task_id: str) -> bool:
+def find_committed_task_ids() -> Set[str]:
+    """Return every task ID mentioned in git commit messages (one git log for the whole history)"""
+    output = run_git_command(['log', '--all', '--format=%s%n%b'])
+    if output.startswith('ERROR'):
+        return set()
+    return {task_id.upper() for task_id in TASK_ID_RE.findall(output)}
+
+def check_git_commits(task_id: str, committed_ids: Set[str]) -> bool:
     """Check if task ID appears in git commit messages"""
     if not task_id:
         return False
-    output = run_git_command(['log', '--all', '--grep', task_id, '--oneline'])
-    return bool(output and 'ERROR' not in output)
+    return task_id.upper() in committed_ids
+
+def top_keywords(task_text: str, n: int = 3) -> List[str]:
+    """Extract up to n meaningful keywords (skip common words) from task text"""
+    keywords = []
+    for match in KEYWORD_RE.finditer(task_text.lower()):
+        kw = match.group()
+        if kw not in STOP_WORDS:
+            keywords.append(kw)
+            if len(keywords) == n:
+                break
+    return keywords
+
+def scan_code_keywords(keywords: Set[str]) -> Set[str]:
+    """Return the keywords found in source files (one Aho-Corasick pass over all tracked sources)"""
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    
+    # Same file set git grep would search: tracked sources in the working tree
+    output = run_git_command(['ls-files', '-z', '--'] + CODE_PATHSPECS)
+    if output.startswith('ERROR'):
+        return set()
+    found = set()
+    for path in output.split('\0'):
+        if not path:
+            continue
+        try:
+            with open(path, 'rb') as f:
+                text = f.read().decode('utf-8', errors='ignore').lower()
+        except OSError:
+            continue
+        found.update(kw for _, kw in automaton.iter(text))
+        if len(found) == len(keywords):
+            break
+    return found
 
-def check_code_exists(task_text: str, filepath: str) -> Dict[str, bool]:
+def find_code_keywords(keywords: Set[str]) -> Set[str]:
+    """Return the keywords found in source files (one search pass for all keywords)"""
+    if not keywords:
+        return set()
+    if ahocorasick is not None:
+        return scan_code_keywords(keywords)
+    try:
+        # A single ERE alternation is far faster in git grep than many -e/-f patterns;
+        # keywords are purely alphabetic so they need no escaping. It is fed on stdin
+        # because it grows with the backlog and argv entries are capped (128 KiB on Linux).
+        result = subprocess.run(
+            ['git', 'grep', '-i', '-h', '-E', '-f', '-', '--'] + CODE_PATHSPECS,
+            input='|'.join(sorted(keywords)) + '\n',
+            capture_output=True,
+            encoding='utf-8',
+            errors='ignore',
+            timeout=60,
+            cwd=os.getcwd()
+        )
+    except Exception as e:
+        print(f"WARNING: keyword search failed, no code evidence recorded: {e}", file=sys.stderr)
+        return set()
+    # git grep exits 1 when nothing matches; anything else is a real failure
+    if result.returncode == 1:
+        return set()
+    if result.returncode != 0:
+        print(f"WARNING: keyword search failed, no code evidence recorded: {result.stderr.strip()}",
+              file=sys.stderr)
+        return set()
+    # Every line containing any keyword is printed, so substring checks against them are exact
+    # (-o would miss keywords that overlap an earlier match on the same line). Keywords never
+    # contain newlines, so the deduplicated lines can be searched as one string.
+    matched_text = '\n'.join(set(result.stdout.lower().splitlines()))
+    return {kw for kw in keywords if kw in matched_text}
+
+def check_code_exists(task_text: str, code_keywords: Set[str]) -> Dict[str, bool]:
     """Check if code related to task exists in codebase"""
-    results = {
-        'has_implementation': False,
+    return {
+        'has_implementation': any(kw in code_keywords for kw in top_keywords(task_text)),
         'has_tests': False,
         'has_config': False
     }
-    
-    # Extract meaningful keywords (skip common words)
-    stop_words = {'this', 'that', 'with', 'from', 'have', 'will', 'should', 'would', 'could', 
-                  'implement', 'add', 'create', 'update', 'fix', 'remove', 'delete', 'change'}
-    keywords = re.findall(r'\b[a-zA-Z]{5,}\b', task_text.lower())
-    important_keywords = [kw for kw in keywords if kw not in stop_words and len(kw) > 4][:3]
-    
-    if not important_keywords:
-        return results
-    
-    # Quick search using git grep (faster)
-    try:
-        for keyword in important_keywords:
-            # Search in source files
-            result = subprocess.run(
-                ['git', 'grep', '-i', keyword, '--', '*.cs', '*.js', '*.jsx', '*.ts', '*.tsx'],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                cwd=os.getcwd()
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                results['has_implementation'] = True
-                break
-    except:
-        pass
-    
-    return results
 
 def extract_unchecked_tasks(filepath: str) -> List[Dict]:
     """Extract unchecked checkboxes and task items from markdown"""
@@ -109,9 +192,9 @@ def extract_unchecked_tasks(filepath: str) -> List[Dict]:
             lines = f.readlines()
             for i, line in enumerate(lines, 1):
                 # Unchecked checkbox: [ ] - only if it looks like a real task
-                if re.search(r'^\s*[-*]\s*\[ \]', line) or re.search(r'^\s*\d+\.\s*\[ \]', line):
+                if UNCHECKED_BOX_RE.search(line):
                     # Skip if it's just a checklist item (REJECT, WARNING patterns)
-                    if re.search(r'\(REJECT|\(WARNING|\(ACCEPT', line):
+                    if REVIEW_MARKER_RE.search(line):
                         continue
                     # Skip if it's too short or just a note
                     if len(line.strip()) < 20:
@@ -125,9 +208,9 @@ def extract_unchecked_tasks(filepath: str) -> List[Dict]:
                         'task_id': task_id
                     })
                 # TODO/FIXME/XXX patterns (but not in checked boxes or false positives)
-                elif re.search(r'\[x\]', line, re.IGNORECASE):
+                elif CHECKED_RE.search(line):
                     continue  # Skip checked items
-                elif re.search(r'\b(TODO|FIXME|XXX|HACK|PLANNED|FUTURE)\b', line, re.IGNORECASE):
+                elif TODO_RE.search(line):
                     # Skip false positives
                     if any(x in line.lower() for x in ['todo.md', 'note that', 'project note', 'see note']):
                         continue
@@ -155,12 +238,17 @@ def main():
     # Extract all unchecked tasks
     print("\nScanning for unchecked tasks...")
     all_tasks = []
-    for md_file in md_files:
-        tasks = extract_unchecked_tasks(md_file)
-        all_tasks.extend(tasks)
+    # imap (not imap_unordered) keeps tasks in file order so results are stable between runs
+    with multiprocessing.Pool() as pool:
+        for tasks in pool.imap(extract_unchecked_tasks, md_files, chunksize=16):
+            all_tasks.extend(tasks)
     
     print(f"Found {len(all_tasks)} unchecked tasks/todos")
     
+    # Look up all task IDs and keywords in one git call each
+    committed_ids = find_committed_task_ids()
+    code_keywords = find_code_keywords({kw for t in all_tasks for kw in top_keywords(t['text'])})
+    
     # Validate each task (with progress updates)
     print("\n" + "=" * 80)
     print("VALIDATING TASKS")
@@ -181,10 +269,10 @@ def main():
         
         # Check git commits
         if task['task_id']:
-            validation['has_commit'] = check_git_commits(task['task_id'])
+            validation['has_commit'] = check_git_commits(task['task_id'], committed_ids)
         
         # Check code existence
-        code_check = check_code_exists(task['text'], task['file'])
+        code_check = check_code_exists(task['text'], code_keywords)
         validation['has_code'] = code_check
         
         # Determine status
@@ -209,8 +297,11 @@ def main():
     
     # Save results
     output_file = 'task_validation_results.json'
-    with open(output_file, 'w') as f:
-        json.dump(validated_tasks, f, indent=2)
+    if orjson is not None:
+        Path(output_file).write_bytes(orjson.dumps(validated_tasks, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(validated_tasks, f, indent=2)
     print(f"\nResults saved to: {output_file}")
     
     # Print likely complete tasks